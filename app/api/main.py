@@ -1,11 +1,13 @@
+import asyncio
 import logging
-from typing import List, Dict, Any, Set
+from typing import Dict, Any, Optional, Set
 
+import orjson
 from fastapi import FastAPI, HTTPException, Response
 from prometheus_client import Gauge, generate_latest, CONTENT_TYPE_LATEST
 
 from app import config
-from app.ml.anomaly_detector import AnomalyDetector, PodAnomalyResult
+from app.ml.anomaly_detector import AnomalyDetector, AnomalyResults
 from app.prometheus.api_client import PrometheusAPI, PrometheusError
 
 
@@ -29,72 +31,165 @@ anomaly_score_gauge = Gauge(
 )
 
 _known_pods: Set[str] = set()
+_model_task: Optional[asyncio.Task] = None
 
+# Cached per-pod gauge children and the last value written to each, so steady
+# state updates skip both the ``labels()`` lookup and redundant ``set()`` calls.
+_flag_handles: Dict[str, Any] = {}
+_score_handles: Dict[str, Any] = {}
+_last_flag: Dict[str, int] = {}
+_last_score: Dict[str, float] = {}
 
-def _update_prometheus_metrics(results: List[PodAnomalyResult]) -> None:
+
+def _update_prometheus_metrics(results: AnomalyResults) -> None:
     """
     Update Prometheus Gauges for anomaly flag and score for each pod.
 
-    This function also removes metric series for pods that are no longer present
-    in the latest detection results in order to avoid leaking stale labels.
+    Labelled gauge children are cached per pod and only written when the value
+    changed since the previous call. This function also removes metric series for
+    pods that are no longer present in the latest detection results in order to
+    avoid leaking stale labels.
 
     Parameters
     ----------
     results:
-        List of :class:`PodAnomalyResult` instances produced by the detector.
+        :class:`AnomalyResults` produced by the detector.
     """
     global _known_pods
-    current_pods = set()
-
-    for r in results:
-        current_pods.add(r.pod)
-        anomaly_flag_gauge.labels(pod=r.pod).set(r.anomaly_flag)
-        anomaly_score_gauge.labels(pod=r.pod).set(r.anomaly_score)
+    current_pods = set(results.pods)
+
+    for pod, flag, score in zip(
+        results.pods, results.flags.tolist(), results.scores.tolist()
+    ):
+        if _last_flag.get(pod) != flag:
+            handle = _flag_handles.get(pod)
+            if handle is None:
+                handle = _flag_handles[pod] = anomaly_flag_gauge.labels(pod=pod)
+            handle.set(flag)
+            _last_flag[pod] = flag
+
+        if _last_score.get(pod) != score:
+            handle = _score_handles.get(pod)
+            if handle is None:
+                handle = _score_handles[pod] = anomaly_score_gauge.labels(pod=pod)
+            handle.set(score)
+            _last_score[pod] = score
 
     # Remove metrics for pods that disappeared
     pods_to_remove = _known_pods - current_pods
     for pod in pods_to_remove:
-        anomaly_flag_gauge.remove(pod=pod)
-        anomaly_score_gauge.remove(pod=pod)
+        anomaly_flag_gauge.remove(pod)
+        anomaly_score_gauge.remove(pod)
+        _flag_handles.pop(pod, None)
+        _score_handles.pop(pod, None)
+        _last_flag.pop(pod, None)
+        _last_score.pop(pod, None)
 
     _known_pods = current_pods
 
 
-@app.on_event("startup")
-def startup_event() -> None:
+async def _initialize_model() -> None:
     """
-    Application startup hook that trains the anomaly detection model.
-
-    The service attempts to train the model from historical metrics during startup.
-    If this fails (for example because Prometheus is temporarily unavailable),
-    the service will still start but ``/detect`` will return HTTP 503 until
-    training is successfully completed.
+    Load or train the anomaly detection model, then keep it fresh.
+
+    A model persisted by a previous run is reused when it matches the current
+    configuration; otherwise the model is trained from historical metrics. If this
+    fails (for example because Prometheus is temporarily unavailable), ``/detect``
+    returns HTTP 503 until training succeeds. When ``RETRAIN_INTERVAL_SECONDS`` is
+    positive, the task then retrains the model periodically, which also covers
+    recovery from a failed initial training.
     """
-    logger.info("Service startup: training anomaly detection model")
     try:
-        detector.train()
-        logger.info("Initial model training succeeded")
-    except (PrometheusError, RuntimeError) as exc:
+        if await detector.load_cached_async():
+            logger.info("Using cached anomaly detection model")
+        else:
+            logger.info("Training anomaly detection model")
+            await detector.train_async()
+            logger.info("Initial model training succeeded")
+    except Exception as exc:  # CancelledError is a BaseException and still propagates
         logger.exception("Initial model training failed: %s", exc)
 
+    if config.RETRAIN_INTERVAL_SECONDS > 0:
+        await detector.retrain_loop()
+
+
+def _log_model_task_exit(task: asyncio.Task) -> None:
+    """
+    Done-callback that reports an unexpected exit of the model initialization task.
+    """
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        logger.error(
+            "Model initialization task died; the model will no longer be trained",
+            exc_info=exc,
+        )
+
+
+@app.on_event("startup")
+async def startup_event() -> None:
+    """
+    Application startup hook that starts model initialization in the background.
+
+    The server accepts connections immediately; ``/readyz`` reports when the model
+    is trained and ``/detect`` can serve requests.
+    """
+    global _model_task
+    logger.info("Service startup: initializing anomaly detection model in background")
+    _model_task = asyncio.create_task(_initialize_model())
+    _model_task.add_done_callback(_log_model_task_exit)
+
+
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    """
+    Application shutdown hook that stops background training and releases
+    pooled Prometheus connections.
+    """
+    if _model_task is not None:
+        _model_task.cancel()
+    await prom_client.aclose()
+
 
 @app.get("/healthz")
-def healthz() -> Dict[str, Any]:
+async def healthz() -> Dict[str, Any]:
     """
     Health check endpoint.
 
     Returns a small JSON payload containing a status flag, whether the model
-    is currently trained, and the configured Prometheus URL.
+    is currently trained (``model_trained``/``ready``), and the configured
+    Prometheus URL. Always answers HTTP 200 while the process is up, so it is
+    suitable as a liveness probe.
     """
     return {
         "status": "ok",
+        "ready": detector.is_trained,
         "model_trained": detector.is_trained,
         "prometheus_url": config.PROMETHEUS_URL,
     }
 
 
+@app.get("/readyz")
+async def readyz() -> Dict[str, Any]:
+    """
+    Readiness endpoint for Kubernetes probes.
+
+    Returns HTTP 200 once the model is trained and HTTP 503 before that, so
+    traffic is only routed to the pod when ``/detect`` can serve requests.
+
+    Raises
+    ------
+    HTTPException
+        503 if the model is not trained yet.
+    """
+    if not detector.is_trained:
+        raise HTTPException(status_code=503, detail="Model is not trained yet.")
+    return {"ready": True}
+
+
 @app.get("/detect")
-def detect() -> Dict[str, Any]:
+async def detect() -> Response:
     """
     Run anomaly detection on current metrics.
 
@@ -104,9 +199,10 @@ def detect() -> Dict[str, Any]:
 
     Returns
     -------
-    dict
-        JSON structure of the form ``{\"pods\": [...]}`` where each item describes
-        a single pod and its associated metrics and anomaly outputs.
+    Response
+        JSON body of the form ``{\"pods\": [...]}`` where each item describes
+        a single pod and its associated metrics and anomaly outputs. The body is
+        serialized directly with :mod:`orjson`, bypassing FastAPI's encoder.
 
     Raises
     ------
@@ -121,7 +217,7 @@ def detect() -> Dict[str, Any]:
         )
 
     try:
-        results = detector.detect_current()
+        results = await detector.detect_current()
     except PrometheusError as exc:
         logger.exception("Failed to query Prometheus during detection: %s", exc)
         raise HTTPException(
@@ -139,21 +235,31 @@ def detect() -> Dict[str, Any]:
 
     payload = [
         {
-            "pod": r.pod,
-            "cpu": r.cpu,
-            "memory": r.memory,
-            "restarts": r.restarts,
-            "anomaly_flag": r.anomaly_flag,
-            "anomaly_score": r.anomaly_score,
+            "pod": pod,
+            "cpu": cpu,
+            "memory": memory,
+            "restarts": restarts,
+            "anomaly_flag": flag,
+            "anomaly_score": score,
         }
-        for r in results
+        for pod, cpu, memory, restarts, flag, score in zip(
+            results.pods,
+            results.cpu.tolist(),
+            results.memory.tolist(),
+            results.restarts.tolist(),
+            results.flags.tolist(),
+            results.scores.tolist(),
+        )
     ]
 
-    return {"pods": payload}
+    return Response(
+        content=orjson.dumps({"pods": payload}),
+        media_type="application/json",
+    )
 
 
 @app.get("/metrics")
-def metrics() -> Response:
+async def metrics() -> Response:
     """
     Prometheus scrape endpoint exposing anomaly metrics.
 
@@ -18,12 +18,27 @@ POD_LABEL = os.getenv("POD_LABEL", "pod")
 # Lookback window (in minutes) for model training
 TRAINING_LOOKBACK_MINUTES = int(os.getenv("TRAINING_LOOKBACK_MINUTES", "60"))
 
-# Step (in seconds) for range queries during training
-QUERY_STEP_SECONDS = int(os.getenv("QUERY_STEP_SECONDS", "60"))
+# Level prefix of a recording rule "<prefix>:pod_cpu:rate1m" precomputing the CPU
+# rate used for training; empty means training evaluates rate() over raw samples
+TRAINING_RECORDING_RULE_PREFIX = os.getenv("TRAINING_RECORDING_RULE_PREFIX", "")
+
+# Step (in seconds) for range queries during training. Without a recording rule
+# the default is coarser so Prometheus evaluates rate() at fewer points.
+QUERY_STEP_SECONDS = int(
+    os.getenv("QUERY_STEP_SECONDS", "60" if TRAINING_RECORDING_RULE_PREFIX else "300")
+)
 
 # Request timeout for Prometheus HTTP calls (seconds)
 REQUEST_TIMEOUT_SECONDS = float(os.getenv("REQUEST_TIMEOUT_SECONDS", "5"))
 
+# Upper bounds on a single Prometheus response (decoded body size and number of
+# series); larger responses are rejected. 0 disables the respective check.
+MAX_RESPONSE_BYTES = int(os.getenv("MAX_RESPONSE_BYTES", str(64 * 1024 * 1024)))
+MAX_SERIES_PER_RESPONSE = int(os.getenv("MAX_SERIES_PER_RESPONSE", "20000"))
+
+# TTL (seconds) of the in-process Prometheus query cache; 0 disables caching
+PROMETHEUS_CACHE_TTL_SECONDS = float(os.getenv("PROMETHEUS_CACHE_TTL_SECONDS", "5"))
+
 # IsolationForest parameters
 IFOREST_N_ESTIMATORS = int(os.getenv("IFOREST_N_ESTIMATORS", "100"))
 _max_samples_env = os.getenv("IFOREST_MAX_SAMPLES", "256")
@@ -31,3 +46,19 @@ IFOREST_MAX_SAMPLES = (
     "auto" if _max_samples_env.lower() == "auto" else int(_max_samples_env)
 )
 IFOREST_CONTAMINATION = os.getenv("IFOREST_CONTAMINATION", "auto")
+
+# Run IsolationForest inference through ONNX Runtime instead of scikit-learn; only
+# faster for small clusters (up to a few hundred pods), slower beyond that
+ONNX_INFERENCE = os.getenv("ONNX_INFERENCE", "false").lower() in ("1", "true", "yes")
+
+# File used to persist the trained model across restarts; empty disables it
+MODEL_CACHE_PATH = os.getenv("MODEL_CACHE_PATH", "/var/cache/anomaly/model.joblib")
+
+# Interval (seconds) between background model retrains; 0 disables retraining
+RETRAIN_INTERVAL_SECONDS = float(os.getenv("RETRAIN_INTERVAL_SECONDS", "900"))
+
+# Trees added to the IsolationForest on each warm-start retrain
+IFOREST_GROW_STEP = int(os.getenv("IFOREST_GROW_STEP", "10"))
+
+# Warm-start retrains applied before the model is refitted from scratch
+IFOREST_MAX_GROW_CYCLES = int(os.getenv("IFOREST_MAX_GROW_CYCLES", "5"))
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import asyncio
+import copy
+import hashlib
 import logging
-import threading
+import os
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 
+import joblib
 import numpy as np
+import onnxruntime
+import skl2onnx
+import sklearn
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
 
@@ -16,33 +23,64 @@ from app.prometheus.api_client import PrometheusAPI, PrometheusError
 logger = logging.getLogger(__name__)
 
 
+def _parse_float(value: Any) -> float | None:
+    """
+    Parse a Prometheus sample value, returning ``None`` if it is not numeric.
+    """
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
 @dataclass
-class PodAnomalyResult:
+class AnomalyResults:
     """
-    Container for per-pod anomaly detection outputs and raw features.
+    Columnar (struct-of-arrays) container for anomaly detection outputs.
+
+    All attributes are parallel sequences indexed by pod position, so consumers
+    can iterate them together with :func:`zip` after a single ``tolist()`` per column.
 
     Attributes
     ----------
-    pod:
-        Pod name as taken from the Prometheus label configured via ``POD_LABEL``.
+    pods:
+        Pod names as taken from the Prometheus label configured via ``POD_LABEL``.
     cpu:
-        CPU usage feature value for the pod at a given point in time.
+        CPU usage feature value per pod.
     memory:
-        Memory usage feature value for the pod at a given point in time.
+        Memory usage feature value per pod.
     restarts:
-        Restart count feature value for the pod at a given point in time.
-    anomaly_flag:
-        Binary flag indicating whether the observation is anomalous
-        (``1`` for anomaly, ``0`` for normal) according to IsolationForest.
-    anomaly_score:
-        IsolationForest decision function value; lower typically means "more anomalous".
+        Restart count feature value per pod.
+    flags:
+        Binary anomaly flags per pod (``1`` for anomaly, ``0`` for normal)
+        according to IsolationForest.
+    scores:
+        IsolationForest decision function value per pod; lower typically means
+        "more anomalous".
     """
-    pod: str
-    cpu: float
-    memory: float
-    restarts: float
-    anomaly_flag: int  # 1 = anomaly, 0 = normal
-    anomaly_score: float
+    pods: List[str]
+    cpu: np.ndarray
+    memory: np.ndarray
+    restarts: np.ndarray
+    flags: np.ndarray  # 1 = anomaly, 0 = normal
+    scores: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.pods)
+
+    @classmethod
+    def empty(cls) -> AnomalyResults:
+        """
+        Build a result set containing no pods.
+        """
+        return cls(
+            pods=[],
+            cpu=np.empty(0, dtype=np.float64),
+            memory=np.empty(0, dtype=np.float64),
+            restarts=np.empty(0, dtype=np.float64),
+            flags=np.empty(0, dtype=np.int8),
+            scores=np.empty(0, dtype=np.float64),
+        )
 
 
 class AnomalyDetector:
@@ -55,7 +93,7 @@ class AnomalyDetector:
     * Building feature vectors ``[cpu, memory, restarts]``.
     * Fitting a :class:`sklearn.preprocessing.StandardScaler` and
       :class:`sklearn.ensemble.IsolationForest` model.
-    * Producing :class:`PodAnomalyResult` objects for the current state of all pods.
+    * Producing an :class:`AnomalyResults` set for the current state of all pods.
     """
 
     def __init__(self, prom_client: PrometheusAPI) -> None:
@@ -69,14 +107,23 @@ class AnomalyDetector:
         """
         self.prom_client = prom_client
         self.scaler = StandardScaler()
-        self.model = IsolationForest(
-            n_estimators=config.IFOREST_N_ESTIMATORS,
-            max_samples=config.IFOREST_MAX_SAMPLES,
-            contamination=config.IFOREST_CONTAMINATION,
-            random_state=42,
-        )
+        self.model = self._build_model()
         self.is_trained = False
-        self._lock = threading.Lock()
+        self._lock = asyncio.Lock()
+        # Number of warm-start growth cycles applied since the last full fit
+        self._grow_cycles = 0
+        # ONNX Runtime session compiled from the fitted forest (None = use sklearn)
+        self._ort_session: onnxruntime.InferenceSession | None = None
+        # Background task compiling and attaching a session to the installed model
+        self._session_task: asyncio.Task | None = None
+
+        # Scaler parameters cached after fitting so inference can scale inline,
+        # plus a reusable feature buffer sized to the largest pod count seen.
+        # Model inputs are float32: the forest's split thresholds are float32
+        # anyway, and it halves the bytes moved per tree traversal.
+        self._mean = np.zeros(3, dtype=np.float32)
+        self._inv_std = np.ones(3, dtype=np.float32)
+        self._X_buf = np.empty((0, 3), dtype=np.float32)
 
         # PromQL templates with namespace regex filter
         ns_filter = f',namespace=~"{config.NAMESPACE_REGEX}"'
@@ -94,12 +141,41 @@ class AnomalyDetector:
             f'kube_pod_container_status_restarts_total{{namespace=~"{config.NAMESPACE_REGEX}"}}'
         )
 
-    def train(self) -> None:
+        # Training reads precomputed CPU rates from a recording rule when configured
+        if config.TRAINING_RECORDING_RULE_PREFIX:
+            self.training_cpu_query = (
+                f"{config.TRAINING_RECORDING_RULE_PREFIX}:pod_cpu:rate1m"
+                f'{{namespace=~"{config.NAMESPACE_REGEX}"}}'
+            )
+        else:
+            self.training_cpu_query = self.cpu_query
+
+    @staticmethod
+    def _build_model() -> IsolationForest:
+        """
+        Create an unfitted IsolationForest from the configured parameters.
+
+        Trees are fitted on all available cores, and ``warm_start`` lets
+        :meth:`retrain_async` add trees to an existing forest instead of refitting it.
+        """
+        return IsolationForest(
+            n_estimators=config.IFOREST_N_ESTIMATORS,
+            max_samples=config.IFOREST_MAX_SAMPLES,
+            contamination=config.IFOREST_CONTAMINATION,
+            n_jobs=-1,
+            warm_start=True,
+            random_state=42,
+        )
+
+    async def train_async(self) -> None:
         """
         Train the scaler and IsolationForest model on historical metrics.
 
         The method pulls the last ``TRAINING_LOOKBACK_MINUTES`` of metrics from Prometheus,
-        builds aligned feature vectors, and fits the internal scaler and IsolationForest model.
+        builds aligned feature vectors, and fits a fresh scaler and IsolationForest model.
+        The CPU-bound fitting step runs in a worker thread so the event loop stays responsive.
+        The new model scores with scikit-learn as soon as it is installed; the ONNX
+        export, session build and cache write happen in a background task.
 
         Raises
         ------
@@ -108,34 +184,436 @@ class AnomalyDetector:
         PrometheusError
             If Prometheus is unreachable or returns an invalid response.
         """
-        with self._lock:
-            logger.info("Starting model training from Prometheus range data")
-            X = self._fetch_training_dataset()
+        logger.info("Starting model training from Prometheus range data")
+        X = await self._fetch_training_samples()
 
-            if X.size == 0 or X.shape[0] < 10:
-                raise RuntimeError(
-                    f"Not enough training samples ({X.shape[0]}) to fit IsolationForest"
-                )
+        logger.info("Fitting scaler and IsolationForest on %d samples", X.shape[0])
+        scaler, model = await asyncio.to_thread(self._fit, X)
 
-            logger.info("Fitting scaler and IsolationForest on %d samples", X.shape[0])
-            self.scaler.fit(X)
-            X_scaled = self.scaler.transform(X)
-            self.model.fit(X_scaled)
+        async with self._lock:
+            self._install(scaler, model, None)
+            self._grow_cycles = 0
             self.is_trained = True
-            logger.info("Model training completed")
+        logger.info("Model training completed")
+        self._start_session_task(self._compile_and_save(scaler, model, 0))
+
+    async def retrain_async(self) -> None:
+        """
+        Refresh the model with the latest training window.
+
+        While fewer than ``IFOREST_MAX_GROW_CYCLES`` growth cycles have been applied,
+        ``IFOREST_GROW_STEP`` new trees are fitted on the latest window and added to
+        a copy of the existing forest (the scaler is left unchanged so old and new trees
+        see the same feature space). After that many cycles the scaler and forest are
+        refitted from scratch to bound the forest's size. An untrained detector is
+        trained fully.
+
+        Raises
+        ------
+        RuntimeError
+            If an insufficient number of samples is available to fit the model.
+        PrometheusError
+            If Prometheus is unreachable or returns an invalid response.
+        """
+        if not self.is_trained or self._grow_cycles >= config.IFOREST_MAX_GROW_CYCLES:
+            await self.train_async()
+            return
+
+        logger.info("Starting incremental model retraining from Prometheus range data")
+        X = await self._fetch_training_samples()
+        model = await asyncio.to_thread(self._grow, X)
+
+        async with self._lock:
+            self._install(self.scaler, model, None)
+            self._grow_cycles += 1
+            grow_cycles = self._grow_cycles
+        logger.info(
+            "Grew IsolationForest to %d trees on %d samples",
+            model.n_estimators,
+            X.shape[0],
+        )
+        self._start_session_task(
+            self._compile_and_save(self.scaler, model, grow_cycles)
+        )
+
+    async def load_cached_async(self) -> bool:
+        """
+        Restore a previously trained scaler and model from ``MODEL_CACHE_PATH``.
+
+        The cached state is only used if its fingerprint matches the current
+        queries, IsolationForest parameters and scikit-learn version. The detector
+        is ready as soon as the scaler and model are installed and scores with
+        scikit-learn at first; the ONNX export saved alongside the model is loaded
+        into an inference session in the background and swapped in when ready. A
+        cache without an export is compiled in the background instead.
 
-    def detect_current(self) -> List[PodAnomalyResult]:
+        Returns
+        -------
+        bool
+            ``True`` if a matching model was loaded and the detector is ready.
+        """
+        if not config.MODEL_CACHE_PATH:
+            return False
+
+        loaded = await asyncio.to_thread(self._load_cached)
+        if loaded is None:
+            return False
+
+        scaler, model, onnx_bytes, grow_cycles = loaded
+        async with self._lock:
+            self._install(scaler, model, None)
+            self._grow_cycles = grow_cycles
+            self.is_trained = True
+        logger.info("Loaded cached model from %s", config.MODEL_CACHE_PATH)
+
+        if config.ONNX_INFERENCE:
+            if onnx_bytes is not None:
+                self._start_session_task(self._attach_session(model, onnx_bytes))
+            else:
+                self._start_session_task(
+                    self._compile_and_save(scaler, model, grow_cycles)
+                )
+        return True
+
+    def _start_session_task(self, coro: Any) -> None:
+        """
+        Run ``coro`` as the background session task, cancelling any previous one.
+        """
+        if self._session_task is not None:
+            self._session_task.cancel()
+        self._session_task = asyncio.create_task(coro)
+
+    async def _compile_and_save(
+        self, scaler: StandardScaler, model: IsolationForest, grow_cycles: int
+    ) -> None:
+        """
+        Export ``model`` to ONNX, attach a session for it and persist it.
+
+        The export of a large forest takes seconds, so it runs after the detector
+        is already serving ``model`` with scikit-learn. Nothing is saved if a
+        retrain replaced the model in the meantime.
+        """
+        onnx_bytes = await asyncio.to_thread(self._export_onnx, model)
+        if onnx_bytes is not None:
+            await self._attach_session(model, onnx_bytes)
+        if self.model is model:
+            await asyncio.to_thread(
+                self._save_cached, scaler, model, grow_cycles, onnx_bytes
+            )
+
+    async def _attach_session(self, model: IsolationForest, onnx_bytes: bytes) -> None:
+        """
+        Build an inference session for ``model`` and install it if still current.
+
+        Building the session for a large forest takes seconds, so this runs after
+        the detector is already serving with scikit-learn. The session is dropped
+        if a retrain replaced the model in the meantime.
+        """
+        session = await asyncio.to_thread(self._load_session, onnx_bytes)
+        async with self._lock:
+            if session is not None and self.model is model:
+                self._ort_session = session
+                logger.info("ONNX inference session ready")
+
+    async def retrain_loop(self) -> None:
+        """
+        Periodically call :meth:`retrain_async` every ``RETRAIN_INTERVAL_SECONDS``.
+
+        Any failure (Prometheus errors, bad training windows, fitting errors) is
+        logged and retried on the next interval; the loop runs until the task is
+        cancelled.
+        """
+        while True:
+            await asyncio.sleep(config.RETRAIN_INTERVAL_SECONDS)
+            try:
+                await self.retrain_async()
+            except Exception as exc:  # CancelledError is a BaseException and still stops the loop
+                logger.exception("Periodic model retraining failed: %s", exc)
+
+    async def _fetch_training_samples(self) -> np.ndarray:
+        """
+        Fetch the training window and check that it is large enough to fit on.
+
+        Raises
+        ------
+        RuntimeError
+            If fewer than 10 aligned samples are available.
+        """
+        X = await self._fetch_training_dataset()
+
+        if X.size == 0 or X.shape[0] < 10:
+            raise RuntimeError(
+                f"Not enough training samples ({X.shape[0]}) to fit IsolationForest"
+            )
+        return X
+
+    def _fingerprint(self) -> str:
+        """
+        Hash the settings a persisted model depends on.
+        """
+        key = (
+            self.cpu_query,
+            self.training_cpu_query,
+            self.mem_query,
+            self.restarts_query,
+            config.POD_LABEL,
+            config.TRAINING_LOOKBACK_MINUTES,
+            config.QUERY_STEP_SECONDS,
+            config.IFOREST_N_ESTIMATORS,
+            config.IFOREST_MAX_SAMPLES,
+            config.IFOREST_CONTAMINATION,
+            sklearn.__version__,
+        )
+        return hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+
+    def _save_cached(
+        self,
+        scaler: StandardScaler,
+        model: IsolationForest,
+        grow_cycles: int,
+        onnx_bytes: bytes | None,
+    ) -> None:
+        """
+        Persist a fitted scaler/model pair and its ONNX export to ``MODEL_CACHE_PATH``.
+
+        The file is written to a temporary path and renamed into place so a crash
+        mid-write never leaves a truncated cache. Failures are logged, not raised.
+        """
+        path = config.MODEL_CACHE_PATH
+        if not path:
+            return
+
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            joblib.dump(
+                {
+                    "scaler": scaler,
+                    "model": model,
+                    "grow_cycles": grow_cycles,
+                    "onnx": onnx_bytes,
+                    "fingerprint": self._fingerprint(),
+                },
+                tmp_path,
+                compress=3,
+            )
+            os.replace(tmp_path, path)
+        except Exception as exc:  # saving is best-effort; pickling can fail in many ways
+            logger.warning("Failed to persist model to %s: %s", path, exc)
+
+    def _load_cached(self) -> Tuple[Any, ...] | None:
+        """
+        Load and validate the persisted model state.
+
+        Returns
+        -------
+        tuple or None
+            The scaler, model, serialized ONNX export and growth cycle count, or
+            ``None`` if the cache is missing, unreadable, malformed or stale.
+        """
+        path = config.MODEL_CACHE_PATH
+        try:
+            state = joblib.load(path)
+        except FileNotFoundError:
+            return None
+        except Exception as exc:  # unpickling can fail in many ways
+            logger.warning("Failed to load cached model from %s: %s", path, exc)
+            return None
+
+        if not (
+            isinstance(state, dict)
+            and isinstance(state.get("scaler"), StandardScaler)
+            and isinstance(state.get("model"), IsolationForest)
+            and isinstance(state.get("grow_cycles"), int)
+            and isinstance(state.get("onnx"), (bytes, type(None)))
+        ):
+            logger.warning("Ignoring malformed cached model at %s", path)
+            return None
+
+        if state.get("fingerprint") != self._fingerprint():
+            logger.info("Cached model at %s does not match current configuration", path)
+            return None
+
+        return state["scaler"], state["model"], state["onnx"], state["grow_cycles"]
+
+    def _fit(self, X: np.ndarray) -> Tuple[Any, ...]:
+        """
+        Fit a new scaler and IsolationForest model on a prepared feature matrix.
+
+        Nothing on the detector is modified; the caller installs the returned
+        objects with :meth:`_install`.
+
+        Parameters
+        ----------
+        X:
+            Array of shape ``(n_samples, 3)`` with ``[cpu, memory, restarts]`` rows.
+
+        Returns
+        -------
+        tuple
+            The fitted scaler and the fitted model.
+        """
+        scaler = StandardScaler().fit(X)
+        model = self._build_model()
+        model.fit(scaler.transform(X))
+        return scaler, model
+
+    def _grow(self, X: np.ndarray) -> IsolationForest:
+        """
+        Fit ``IFOREST_GROW_STEP`` more trees on ``X`` into a copy of the current forest.
+
+        Parameters
+        ----------
+        X:
+            Array of shape ``(n_samples, 3)`` with raw ``[cpu, memory, restarts]``
+            rows; it is scaled in place.
+
+        Returns
+        -------
+        IsolationForest
+            The grown model.
+        """
+        model = copy.deepcopy(self.model)
+        model.n_estimators += config.IFOREST_GROW_STEP
+        model.fit(self._scale(X))
+        return model
+
+    def _install(
+        self,
+        scaler: StandardScaler,
+        model: IsolationForest,
+        session: onnxruntime.InferenceSession | None,
+    ) -> None:
+        """
+        Swap in a fitted scaler/model pair and cache the scaler parameters.
+
+        Must be called with the detector lock held.
+        """
+        self.scaler = scaler
+        self.model = model
+        self._ort_session = session
+        self._mean = scaler.mean_.astype(np.float32)
+        self._inv_std = (1.0 / scaler.scale_).astype(np.float32)
+
+    @staticmethod
+    def _export_onnx(model: IsolationForest) -> bytes | None:
+        """
+        Export a fitted forest to a serialized ONNX model.
+
+        This is the slow step of compilation (seconds for a 100-tree forest), so the
+        result is also persisted with the model cache.
+
+        Returns
+        -------
+        bytes or None
+            ``None`` if ``ONNX_INFERENCE`` is disabled or the export fails, in which
+            case :meth:`_decision_function` falls back to scikit-learn.
+        """
+        if not config.ONNX_INFERENCE:
+            return None
+
+        try:
+            onnx_model = skl2onnx.to_onnx(
+                model,
+                np.zeros((1, 3), dtype=np.float32),
+                target_opset={"": 17, "ai.onnx.ml": 3},
+            )
+        except Exception as exc:  # the converter raises a variety of types
+            logger.warning(
+                "Failed to export IsolationForest to ONNX, using scikit-learn: %s", exc
+            )
+            return None
+        return onnx_model.SerializeToString()
+
+    @staticmethod
+    def _load_session(onnx_bytes: bytes | None) -> onnxruntime.InferenceSession | None:
+        """
+        Build an ONNX Runtime session from a serialized forest.
+
+        Inference then runs through the compiled tree ensemble instead of
+        scikit-learn's per-tree traversal.
+
+        Returns
+        -------
+        onnxruntime.InferenceSession or None
+            ``None`` if there is no export, ``ONNX_INFERENCE`` is disabled or the
+            session cannot be created.
+        """
+        if onnx_bytes is None or not config.ONNX_INFERENCE:
+            return None
+
+        try:
+            return onnxruntime.InferenceSession(
+                onnx_bytes, providers=["CPUExecutionProvider"]
+            )
+        except Exception as exc:  # onnxruntime raises its own exception types
+            logger.warning(
+                "Failed to load ONNX IsolationForest, using scikit-learn: %s", exc
+            )
+            return None
+
+    def _decision_function(self, X_scaled: np.ndarray) -> np.ndarray:
+        """
+        Compute IsolationForest decision function values for scaled features.
+
+        Parameters
+        ----------
+        X_scaled:
+            Array of shape ``(n_pods, 3)`` with standardized features.
+
+        Returns
+        -------
+        numpy.ndarray
+            One score per row; negative values are anomalies.
+        """
+        if self._ort_session is not None:
+            scores = self._ort_session.run(
+                ["scores"], {"X": X_scaled.astype(np.float32, copy=False)}
+            )[0]
+            return scores.ravel()
+        return self.model.decision_function(X_scaled)
+
+    def _scale(self, X: np.ndarray) -> np.ndarray:
+        """
+        Standardize ``X`` in place with the fitted scaler parameters.
+
+        Equivalent to ``self.scaler.transform(X)`` but skips scikit-learn's input
+        validation and allocates nothing.
+
+        Parameters
+        ----------
+        X:
+            Array of shape ``(n_pods, 3)`` with raw ``[cpu, memory, restarts]`` rows.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``X`` itself, now holding scaled features.
+        """
+        np.subtract(X, self._mean, out=X)
+        np.multiply(X, self._inv_std, out=X)
+        return X
+
+    def _feature_buffer(self, n: int) -> np.ndarray:
+        """
+        Return an ``(n, 3)`` view of the reusable feature buffer, growing it if needed.
+        """
+        if self._X_buf.shape[0] < n:
+            self._X_buf = np.empty((n, 3), dtype=np.float32)
+        return self._X_buf[:n]
+
+    async def detect_current(self) -> AnomalyResults:
         """
         Run anomaly detection on the most recent metrics.
 
-        This method performs instant queries for CPU, memory, and restart metrics,
-        aligns them per pod, applies the fitted scaler and IsolationForest model,
+        This method performs concurrent instant queries for CPU, memory, and restart
+        metrics, aligns them per pod, applies the fitted scaler and IsolationForest model,
         and returns anomaly scores and flags.
 
         Returns
         -------
-        list of PodAnomalyResult
-            One result per pod that has all required metrics.
+        AnomalyResults
+            Columnar results covering every pod that has all required metrics.
 
         Raises
         ------
@@ -144,75 +622,78 @@ class AnomalyDetector:
         PrometheusError
             If Prometheus is unreachable or returns an invalid response.
         """
-        with self._lock:
-            if not self.is_trained:
-                raise RuntimeError("Model is not trained yet")
+        if not self.is_trained:
+            raise RuntimeError("Model is not trained yet")
+
+        # Prometheus I/O happens outside the lock so concurrent requests overlap;
+        # the lock only guards the fitted scaler/model against a concurrent retrain.
+        logger.debug("Fetching current metrics for anomaly detection")
+        cpu_result, mem_result, restart_result = await asyncio.gather(
+            self.prom_client.query(self.cpu_query),
+            self.prom_client.query(self.mem_query),
+            self.prom_client.query(self.restarts_query),
+        )
 
-            logger.debug("Fetching current metrics for anomaly detection")
-            cpu_result = self.prom_client.query(self.cpu_query)
-            mem_result = self.prom_client.query(self.mem_query)
-            restart_result = self.prom_client.query(self.restarts_query)
+        cpu_by_pod = self._extract_instant_by_pod(cpu_result)
+        mem_by_pod = self._extract_instant_by_pod(mem_result)
+        restarts_by_pod = self._extract_instant_by_pod(restart_result)
 
-            cpu_by_pod = self._extract_instant_by_pod(cpu_result)
-            mem_by_pod = self._extract_instant_by_pod(mem_result)
-            restarts_by_pod = self._extract_instant_by_pod(restart_result)
+        common_pods = (
+            set(cpu_by_pod.keys())
+            & set(mem_by_pod.keys())
+            & set(restarts_by_pod.keys())
+        )
 
-            common_pods = (
-                set(cpu_by_pod.keys())
-                & set(mem_by_pod.keys())
-                & set(restarts_by_pod.keys())
+        if not common_pods:
+            logger.warning(
+                "No pods have all three metrics (cpu, memory, restarts) at current time"
             )
+            return AnomalyResults.empty()
+
+        pods_sorted = sorted(common_pods)
+        # Raw features stay float64 so the reported values are exact
+        raw = np.array(
+            [
+                [cpu_by_pod[pod] for pod in pods_sorted],
+                [mem_by_pod[pod] for pod in pods_sorted],
+                [restarts_by_pod[pod] for pod in pods_sorted],
+            ],
+            dtype=np.float64,
+        )
+        async with self._lock:
+            # The float32 buffer is shared across requests, so fill and consume
+            # it under the lock.
+            X = self._feature_buffer(len(pods_sorted))
+            X[:] = raw.T
+            scores = self._decision_function(self._scale(X))
+
+        # IsolationForest.predict is ``decision_function < 0`` (offset_ is already
+        # subtracted), so derive flags from the scores instead of a second forest pass.
+        flags = (scores < 0).astype(np.int8)  # 1 = anomaly, 0 = normal
+
+        results = AnomalyResults(
+            pods=pods_sorted,
+            cpu=raw[0],
+            memory=raw[1],
+            restarts=raw[2],
+            flags=flags,
+            scores=scores,
+        )
 
-            if not common_pods:
-                logger.warning(
-                    "No pods have all three metrics (cpu, memory, restarts) at current time"
-                )
-                return []
-
-            pods_sorted = sorted(common_pods)
-            features = []
-            for pod in pods_sorted:
-                features.append(
-                    [
-                        cpu_by_pod[pod],
-                        mem_by_pod[pod],
-                        restarts_by_pod[pod],
-                    ]
-                )
-
-            X = np.array(features, dtype=float)
-            X_scaled = self.scaler.transform(X)
-            scores = self.model.decision_function(X_scaled)
-            preds = self.model.predict(X_scaled)  # 1 for normal, -1 for anomaly
-
-            results: List[PodAnomalyResult] = []
-            for pod, score, pred in zip(pods_sorted, scores, preds):
-                flag = 1 if pred == -1 else 0
-                results.append(
-                    PodAnomalyResult(
-                        pod=pod,
-                        cpu=cpu_by_pod[pod],
-                        memory=mem_by_pod[pod],
-                        restarts=restarts_by_pod[pod],
-                        anomaly_flag=flag,
-                        anomaly_score=float(score),
-                    )
-                )
-
-            logger.info("Computed anomaly scores for %d pods", len(results))
-            return results
+        logger.info("Computed anomaly scores for %d pods", len(results))
+        return results
 
-    def _fetch_training_dataset(self) -> np.ndarray:
+    async def _fetch_training_dataset(self) -> np.ndarray:
         """
         Build the training dataset from Prometheus range queries.
 
-        This helper calls ``/api/v1/query_range`` for CPU, memory and restarts, then
-        aligns the resulting time series for pods that are present in all three metrics.
+        This helper calls ``/api/v1/query_range`` for CPU, memory and restarts concurrently,
+        then aligns the resulting time series for pods that are present in all three metrics.
 
         Returns
         -------
         numpy.ndarray
-            Two-dimensional array of shape ``(n_samples, 3)`` containing
+            Two-dimensional ``float32`` array of shape ``(n_samples, 3)`` containing
             ``[cpu, memory, restarts]`` feature vectors. If no aligned data is
             available, an empty array with shape ``(0, 3)`` is returned.
         """
@@ -227,10 +708,10 @@ class AnomalyDetector:
             step_str,
         )
 
-        cpu_result = self.prom_client.query_range(self.cpu_query, start, now, step_str)
-        mem_result = self.prom_client.query_range(self.mem_query, start, now, step_str)
-        restart_result = self.prom_client.query_range(
-            self.restarts_query, start, now, step_str
+        cpu_result, mem_result, restart_result = await asyncio.gather(
+            self.prom_client.query_range(self.training_cpu_query, start, now, step_str),
+            self.prom_client.query_range(self.mem_query, start, now, step_str),
+            self.prom_client.query_range(self.restarts_query, start, now, step_str),
         )
 
         cpu_by_pod = self._extract_range_by_pod(cpu_result)
@@ -247,31 +728,37 @@ class AnomalyDetector:
             logger.warning(
                 "No pods have all three metrics across the training window; training dataset will be empty"
             )
-            return np.empty((0, 3), dtype=float)
-
-        X: List[List[float]] = []
-        for pod in common_pods:
-            cpu_series = cpu_by_pod[pod]
-            mem_series = mem_by_pod[pod]
-            restart_series = restarts_by_pod[pod]
-            length = min(len(cpu_series), len(mem_series), len(restart_series))
-            for i in range(length):
-                X.append(
-                    [
-                        cpu_series[i],
-                        mem_series[i],
-                        restart_series[i],
-                    ]
-                )
-
-        if not X:
+            return np.empty((0, 3), dtype=np.float32)
+
+        pods = list(common_pods)
+        lengths = np.fromiter(
+            (
+                min(cpu_by_pod[pod].size, mem_by_pod[pod].size, restarts_by_pod[pod].size)
+                for pod in pods
+            ),
+            dtype=np.intp,
+            count=len(pods),
+        )
+        total = int(lengths.sum())
+        if total == 0:
             logger.warning("No aligned samples were built for training")
-            return np.empty((0, 3), dtype=float)
+            return np.empty((0, 3), dtype=np.float32)
+
+        # Copy each pod's aligned prefix straight into its row range of the output,
+        # avoiding per-pod temporaries and a final concatenate.
+        X = np.empty((total, 3), dtype=np.float32)
+        offset = 0
+        for pod, length in zip(pods, lengths.tolist()):
+            end = offset + length
+            X[offset:end, 0] = cpu_by_pod[pod][:length]
+            X[offset:end, 1] = mem_by_pod[pod][:length]
+            X[offset:end, 2] = restarts_by_pod[pod][:length]
+            offset = end
 
-        return np.array(X, dtype=float)
+        return X
 
     @staticmethod
-    def _extract_range_by_pod(result: List[Dict[str, Any]]) -> Dict[str, List[float]]:
+    def _extract_range_by_pod(result: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
         """
         Convert a Prometheus range query result into a mapping by pod.
 
@@ -283,9 +770,9 @@ class AnomalyDetector:
         Returns
         -------
         dict
-            Mapping of pod name to a list of float samples ordered by time.
+            Mapping of pod name to a 1-D ``float32`` array of samples ordered by time.
         """
-        by_pod: Dict[str, List[float]] = {}
+        by_pod: Dict[str, np.ndarray] = {}
         for ts in result:
             metric = ts.get("metric", {})
             pod = metric.get(config.POD_LABEL)
@@ -293,14 +780,19 @@ class AnomalyDetector:
                 continue
 
             values = ts.get("values", [])
-            series: List[float] = []
-            for _, value_str in values:
-                try:
-                    series.append(float(value_str))
-                except (TypeError, ValueError):
-                    continue
-
-            if series:
+            try:
+                # NumPy parses the value strings in C (including "NaN"/"+Inf")
+                series = np.asarray([value_str for _, value_str in values], dtype=np.float32)
+            except (TypeError, ValueError):
+                # Slow path: drop individual samples that cannot be parsed.
+                kept = [
+                    value
+                    for _, value_str in values
+                    if (value := _parse_float(value_str)) is not None
+                ]
+                series = np.array(kept, dtype=np.float32)
+
+            if series.size:
                 by_pod[pod] = series
 
         return by_pod
@@ -320,23 +812,12 @@ class AnomalyDetector:
         dict
             Mapping of pod name to a single float value for the current timestamp.
         """
-        by_pod: Dict[str, float] = {}
-        for ts in result:
-            metric = ts.get("metric", {})
-            pod = metric.get(config.POD_LABEL)
-            if not pod:
-                continue
-
-            value_pair = ts.get("value")
-            if not value_pair or len(value_pair) != 2:
-                continue
-
-            _, value_str = value_pair
-            try:
-                value = float(value_str)
-            except (TypeError, ValueError):
-                continue
-
-            by_pod[pod] = value
-
-        return by_pod
+        pod_label = config.POD_LABEL
+        return {
+            pod: value
+            for ts in result
+            if (pod := ts.get("metric", {}).get(pod_label))
+            and (value_pair := ts.get("value"))
+            and len(value_pair) == 2
+            and (value := _parse_float(value_pair[1])) is not None
+        }
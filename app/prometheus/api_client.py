@@ -1,8 +1,9 @@
+import time
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 
-import requests
-from requests import RequestException
+import httpx
+import orjson
 
 from app import config
 
@@ -11,7 +12,7 @@ class PrometheusError(Exception):
     """
     Exception raised when Prometheus HTTP API calls fail or return invalid data.
 
-    This is used to wrap lower-level :mod:`requests` exceptions as well as
+    This is used to wrap lower-level :mod:`httpx` exceptions as well as
     unexpected HTTP status codes or response payloads from Prometheus.
     """
 
@@ -25,11 +26,29 @@ class PrometheusAPI:
     * ``/api/v1/query`` via :meth:`query`
     * ``/api/v1/query_range`` via :meth:`query_range`
 
-    Both methods return the parsed ``data.result`` list from the Prometheus
-    JSON response or raise :class:`PrometheusError` on error.
+    Both methods are coroutines that return the parsed ``data.result`` list
+    from the Prometheus JSON response or raise :class:`PrometheusError` on error.
+
+    A single persistent :class:`httpx.AsyncClient` with a keep-alive pool is shared
+    by all calls; call :meth:`aclose` on shutdown to release its connections. HTTP/2
+    is only negotiated over TLS (``https://`` URLs), where concurrent queries are
+    multiplexed over one connection. A cleartext ``http://`` Prometheus is spoken to
+    over HTTP/1.1, so concurrent queries use separate pooled connections that are
+    reused across calls. Queries are sent as form-encoded ``POST`` bodies so long
+    PromQL expressions are not limited by URL length.
+
+    Instant query results are memoized in a small in-process TTL cache keyed by
+    the current TTL window, so repeated identical requests within a window do not
+    reach Prometheus. Range queries are only issued for training, are rarely
+    repeated within a TTL and can be large, so they are not cached.
     """
 
-    def __init__(self, base_url: str | None = None, timeout: float | None = None) -> None:
+    def __init__(
+        self,
+        base_url: str | None = None,
+        timeout: float | None = None,
+        cache_ttl: float | None = None,
+    ) -> None:
         """
         Create a new Prometheus API client.
 
@@ -41,18 +60,156 @@ class PrometheusAPI:
         timeout:
             Request timeout in seconds. If omitted, :data:`app.config.REQUEST_TIMEOUT_SECONDS`
             is used.
+        cache_ttl:
+            Lifetime of cached query results in seconds; ``0`` disables the cache.
+            If omitted, :data:`app.config.PROMETHEUS_CACHE_TTL_SECONDS` is used.
         """
         self.base_url = (base_url or config.PROMETHEUS_URL).rstrip("/")
         self.timeout = timeout or config.REQUEST_TIMEOUT_SECONDS
+        self.cache_ttl = (
+            config.PROMETHEUS_CACHE_TTL_SECONDS if cache_ttl is None else cache_ttl
+        )
+        self._cache: Dict[Tuple[Any, ...], Tuple[float, List[Dict[str, Any]]]] = {}
+        self.max_response_bytes = config.MAX_RESPONSE_BYTES
+        self.max_series = config.MAX_SERIES_PER_RESPONSE
+        # Bounded keep-alive pool; the transport retries failed connection attempts
+        # (not failed requests) so a restarting Prometheus does not fail a call outright.
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            retries=2,
+        )
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            transport=transport,
+        )
+
+    async def aclose(self) -> None:
+        """
+        Close the underlying HTTP client and its pooled connections.
+        """
+        await self._client.aclose()
 
-    def _handle_response(self, resp: requests.Response) -> List[Dict[str, Any]]:
+    def _cache_get(self, key: Tuple[Any, ...], now: float) -> List[Dict[str, Any]] | None:
+        """
+        Return a cached result for ``key`` if present and not expired.
+
+        Entries older than twice the TTL are evicted as a side effect.
+
+        Parameters
+        ----------
+        key:
+            Cache key built by :meth:`query`.
+        now:
+            Current :func:`time.monotonic` value.
+
+        Returns
+        -------
+        list of dict or None
+            The cached ``data.result`` list, or ``None`` on a miss.
+        """
+        if self.cache_ttl <= 0:
+            return None
+
+        stale = [k for k, (ts, _) in self._cache.items() if now - ts > 2 * self.cache_ttl]
+        for k in stale:
+            del self._cache[k]
+
+        entry = self._cache.get(key)
+        if entry is None or now - entry[0] > self.cache_ttl:
+            return None
+        return entry[1]
+
+    def _cache_put(
+        self, key: Tuple[Any, ...], now: float, result: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Store a query result in the TTL cache (no-op when caching is disabled).
+        """
+        if self.cache_ttl > 0:
+            self._cache[key] = (now, result)
+
+    @staticmethod
+    def _step_seconds(step: str) -> int | None:
+        """
+        Parse a Prometheus step such as ``\"60s\"`` or ``\"5m\"`` into seconds.
+
+        Returns ``None`` for formats that are not understood, in which case the
+        query window is not snapped.
+        """
+        units = {"s": 1, "m": 60, "h": 3600}
+        try:
+            if step[-1] in units:
+                seconds = int(step[:-1]) * units[step[-1]]
+            else:
+                seconds = int(float(step))
+        except (IndexError, ValueError):
+            return None
+        return seconds if seconds > 0 else None
+
+    async def _post(self, path: str, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Send a form-encoded ``POST`` to a Prometheus API endpoint and parse the result.
+
+        The body is streamed and the request is aborted as soon as either the
+        declared ``Content-Length`` or the bytes received exceed
+        ``MAX_RESPONSE_BYTES``, so an oversized response is never fully buffered.
+
+        Parameters
+        ----------
+        path:
+            API path relative to the base URL, e.g. ``\"/api/v1/query\"``.
+        data:
+            Form parameters for the request.
+
+        Returns
+        -------
+        list of dict
+            The ``data.result`` list from the Prometheus response.
+
+        Raises
+        ------
+        PrometheusError
+            If the HTTP request fails, the response is too large, or Prometheus
+            returns an error.
+        """
+        url = f"{self.base_url}{path}"
+        try:
+            async with self._client.stream("POST", path, data=data) as resp:
+                declared = resp.headers.get("Content-Length")
+                if declared is not None and declared.isdigit():
+                    self._check_size(int(declared), url)
+
+                chunks: List[bytes] = []
+                received = 0
+                async for chunk in resp.aiter_bytes():
+                    received += len(chunk)
+                    self._check_size(received, url)
+                    chunks.append(chunk)
+        except httpx.HTTPError as exc:
+            raise PrometheusError(f"Failed to query Prometheus at {url}: {exc}") from exc
+        return self._handle_response(resp.status_code, b"".join(chunks))
+
+    def _check_size(self, size: int, url: str) -> None:
+        """
+        Raise :class:`PrometheusError` if ``size`` exceeds ``MAX_RESPONSE_BYTES``.
+        """
+        if self.max_response_bytes > 0 and size > self.max_response_bytes:
+            raise PrometheusError(
+                f"Prometheus response from {url} exceeds {self.max_response_bytes} bytes"
+            )
+
+    def _handle_response(self, status_code: int, body: bytes) -> List[Dict[str, Any]]:
         """
         Validate and parse a Prometheus HTTP response.
 
         Parameters
         ----------
-        resp:
-            Response object returned by :func:`requests.get`.
+        status_code:
+            HTTP status code of the response.
+        body:
+            Raw (decompressed) response body.
 
         Returns
         -------
@@ -63,14 +220,16 @@ class PrometheusAPI:
         ------
         PrometheusError
             If the HTTP status code is non-200, the body cannot be decoded as JSON,
-            or the payload status is not ``\"success\"``.
+            the payload status is not ``\"success\"``, or the result holds more than
+            ``MAX_SERIES_PER_RESPONSE`` series.
         """
-        if resp.status_code != 200:
-            raise PrometheusError(f"Prometheus HTTP {resp.status_code}: {resp.text}")
+        if status_code != 200:
+            text = body.decode("utf-8", errors="replace")
+            raise PrometheusError(f"Prometheus HTTP {status_code}: {text}")
 
         try:
-            payload = resp.json()
-        except ValueError as exc:  # JSON decode error
+            payload = orjson.loads(body)
+        except orjson.JSONDecodeError as exc:
             raise PrometheusError("Failed to decode Prometheus response as JSON") from exc
 
         if payload.get("status") != "success":
@@ -81,9 +240,15 @@ class PrometheusAPI:
         if result is None:
             raise PrometheusError("Prometheus response has no 'data.result' field")
 
+        if self.max_series > 0 and len(result) > self.max_series:
+            raise PrometheusError(
+                f"Prometheus response has {len(result)} series, "
+                f"more than the limit of {self.max_series}"
+            )
+
         return result
 
-    def query(self, promql: str) -> List[Dict[str, Any]]:
+    async def query(self, promql: str) -> List[Dict[str, Any]]:
         """
         Execute an instant Prometheus query (``/api/v1/query``).
 
@@ -102,14 +267,19 @@ class PrometheusAPI:
         PrometheusError
             If the HTTP request fails or Prometheus returns an error.
         """
-        url = f"{self.base_url}/api/v1/query"
-        try:
-            resp = requests.get(url, params={"query": promql}, timeout=self.timeout)
-        except RequestException as exc:
-            raise PrometheusError(f"Failed to query Prometheus at {url}: {exc}") from exc
-        return self._handle_response(resp)
+        now = time.monotonic()
+        key: Tuple[Any, ...] = (promql,)
+        if self.cache_ttl > 0:
+            key = (promql, int(now // self.cache_ttl))
+        cached = self._cache_get(key, now)
+        if cached is not None:
+            return cached
+
+        result = await self._post("/api/v1/query", {"query": promql})
+        self._cache_put(key, now, result)
+        return result
 
-    def query_range(
+    async def query_range(
         self,
         promql: str,
         start: datetime,
@@ -141,15 +311,20 @@ class PrometheusAPI:
         PrometheusError
             If the HTTP request fails or Prometheus returns an error.
         """
-        url = f"{self.base_url}/api/v1/query_range"
+        start_ts = int(start.timestamp())
+        end_ts = int(end.timestamp())
+        step_seconds = self._step_seconds(step)
+        if step_seconds:
+            # Align the window to step boundaries so every training run samples the
+            # same timestamp grid
+            start_ts -= start_ts % step_seconds
+            end_ts -= end_ts % step_seconds
+
         params = {
             "query": promql,
-            "start": int(start.timestamp()),
-            "end": int(end.timestamp()),
+            "start": start_ts,
+            "end": end_ts,
             "step": step,
         }
-        try:
-            resp = requests.get(url, params=params, timeout=self.timeout)
-        except RequestException as exc:
-            raise PrometheusError(f"Failed to query Prometheus at {url}: {exc}") from exc
-        return self._handle_response(resp)
+
+        return await self._post("/api/v1/query_range", params)